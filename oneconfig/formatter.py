@@ -1,6 +1,8 @@
 """Provide an extended Formatter, with more abilities."""
 from string import Formatter as BaseFormatter, _string  # base versions
 
+_SENTINEL = object()  # marks a missing attribute, as ``None`` might be a valid value
+
 
 def list_to_str(names: list, pattern: str = '{n}', sep: str = ', ', last_sep: str = None):
     """Convert a list to a string.
@@ -9,16 +11,18 @@ def list_to_str(names: list, pattern: str = '{n}', sep: str = ', ', last_sep: st
         >>> list_to_str([1,2,3,4], '{n}', ' and ', ' and also ')
         "1 and 2 and 3 and also 4"
     """
-    if last_sep is None:  # by default use the same
-        last_sep = sep
-    max_i = len(names) - 1
-    return sep.join([
-        pattern.format(n=n)
-        for n in names[:-1]
-    ]) + last_sep + pattern.format(n=names[-1])
-
-
-class Formatter(Formatter):
+    if pattern == '{n}':  # common patterns don't need the format parser
+        items = [str(n) for n in names]
+    elif pattern == '"{n}"':
+        items = [f'"{n}"' for n in names]
+    else:
+        items = [pattern.format(n=n) for n in names]
+    if last_sep is None:  # by default use the same, so simply join them
+        return sep.join(items)
+    return sep.join(items[:-1]) + last_sep + items[-1]
+
+
+class Formatter(BaseFormatter):
     """An extended format string formatter.
 
     Formatter with extended conversion symbol
@@ -32,6 +36,7 @@ class Formatter(Formatter):
         """
         self._from_containers = from_containers
         self._dot_item_access = dot_item_access
+        self._compiled = {}  # pattern -> (split pattern, compiled function or None)
 
     def convert_field(self, value, conversion):
         """ Extend conversion symbol
@@ -46,13 +51,11 @@ class Formatter(Formatter):
         * r: convert with repr()
         * a: convert with ascii()
         """
-        try:
-            conversion_function = getattr(self, '_convert_field_' + conversion)
-        except (AttributeError, TypeError):
+        conversion_function = self._converters.get(conversion)
+        if conversion_function is None:
             # Do the default conversion or raise error if no matching conversion found
             return super().convert_field(value, conversion)
-        else:
-            return conversion_function(value)
+        return conversion_function(self, value)
 
     def _convert_field_u(self, value):
         """Convert to upper case."""
@@ -68,10 +71,113 @@ class Formatter(Formatter):
 
     def _convert_field_d(self, value):
         """Convert to a list of double quoted names."""
-        return list_to_str(value, '"{n}"')
+        if not value:
+            return ''
+        return '"' + '", "'.join(map(str, value)) + '"'  # only quote the ends of the join
+
+    def __init_subclass__(cls, **kwargs):
+        """Collect the conversions again, so subclasses can add or override them."""
+        super().__init_subclass__(**kwargs)
+        cls._converters = cls._collect_converters()
+
+    @classmethod
+    def _collect_converters(cls) -> dict:
+        """Map the conversion symbols to the ``_convert_field_*`` methods of the class."""
+        prefix = '_convert_field_'
+        return {
+            name[len(prefix):]: getattr(cls, name)
+            for name in dir(cls)
+            if name.startswith(prefix)
+        }
+
+    def _split_pattern(self, pattern: str) -> list:
+        """Parse a pattern once, so it can be formatted by ``_format_split`` again and again.
+
+        Besides what ``parse`` does, the field names are split up into their parts as well.
+        """
+        split = []
+        for literal_text, field_name, format_spec, conversion in self.parse(pattern):
+            if field_name is None:  # only literal text
+                split.append((literal_text, None, (), format_spec, conversion))
+            else:
+                first, rest = _string.formatter_field_name_split(field_name)
+                split.append((literal_text, first, list(rest), format_spec, conversion))
+        return split
+
+    def _format_split(self, split: list, kwargs) -> str:
+        """Format a pattern, which was already split up by ``_split_pattern``.
+
+        Arguments:
+            split:   the result of ``self._split_pattern(pattern)``
+            kwargs:  the keyword arguments used for the substitutions
+
+        """
+        result = []
+        # bind the methods once instead of looking them up for every field
+        append = result.append
+        get_field = self._get_field_from_parts
+        convert_field = self.convert_field
+        format_field = self.format_field
+        for literal_text, first, rest, format_spec, conversion in split:
+            if literal_text:
+                append(literal_text)
+            if first is not None:
+                obj = convert_field(get_field(first, rest, (), kwargs), conversion)
+                if format_spec and '{' in format_spec:  # nested fields
+                    format_spec = self.vformat(format_spec, (), kwargs)
+                append(format_field(obj, format_spec))
+        return ''.join(result)
+
+    def _compile_pattern(self, pattern: str) -> tuple:
+        """Split and compile a pattern, reusing the result for patterns seen before.
+
+        Returns:
+            the results of ``_split_pattern`` and ``_compile_split`` for the pattern.
+        """
+        compiled = self._compiled.get(pattern)
+        if compiled is None:
+            split = self._split_pattern(pattern)
+            compiled = self._compiled[pattern] = (split, self._compile_split(split))
+        return compiled
+
+    def _compile_split(self, split: list):
+        """Create a function doing the substitutions of a pattern split up by ``_split_pattern``.
+
+        The function takes the keyword arguments (as a dict) and returns the formatted string.
+        ``None`` is returned if the pattern is too complicated, e.g. if it uses positional
+        fields or nested format specs. Use ``_format_split`` for those instead.
+        """
+        if self._from_containers:  # the lookup in the containers can't be inlined
+            return None
+        parts = []
+        for literal_text, first, rest, format_spec, conversion in split:
+            if literal_text:
+                parts.append(repr(literal_text))
+            if first is None:
+                continue
+            if not isinstance(first, str) or (format_spec and '{' in format_spec):
+                return None
+            expression = f's[{first!r}]'
+            for is_attr, i in rest:
+                if is_attr and not self._dot_item_access:
+                    expression = f'g({expression}, {i!r})'
+                else:
+                    expression += f'[{i!r}]'
+            if conversion is not None:
+                expression = f'c({expression}, {conversion!r})'
+            parts.append(f'f({expression}, {format_spec!r})')
+        source = f"lambda s: ''.join(({', '.join(parts)},))" if parts else "lambda s: ''"
+        namespace = {'c': self.convert_field, 'f': self.format_field, 'g': getattr,
+                     '__builtins__': {}}
+        return eval(compile(source, '<pattern>', 'eval'), namespace)
 
     def get_field(self, field_name, args, kwargs):
         first, rest = _string.formatter_field_name_split(field_name)
+        return self._get_field_from_parts(first, rest, args, kwargs), first
+        # return super().get_field(field_name, args, kwargs)
+
+    def _get_field_from_parts(self, first, rest, args, kwargs):
+        """Get the object for a field name, which was already split up."""
         obj = self.get_value(first, args, kwargs)
 
         # loop through the rest of the field_name, doing
@@ -81,24 +187,25 @@ class Formatter(Formatter):
                 obj = getattr(obj, i)
             else:
                 obj = obj[i]
-        return obj, first
-        # return super().get_field(field_name, args, kwargs)
+        return obj
 
     def get_value(self, key, args, kwargs):
         """Get the value."""
         if self._from_containers:  # use args as classes / dicts
             for container in args:
                 if isinstance(container, dict):
-                    try:
+                    if key in container:
                         return container[key]
-                    except KeyError:
-                        continue  # try the next one
                 else:
-                    try:
-                        return getattr(container, key)
-                    except AttributeError:
-                        continue  # try the next one
+                    value = getattr(container, key, _SENTINEL)
+                    if value is not _SENTINEL:
+                        return value
+                # otherwise try the next one
             raise AttributeError(f'No attribute or item named {key} in any of the containers')
 
         else:   # use old implementation
             return super().get_value(key, args, kwargs)
+
+
+# conversion symbol -> method, so no lookup by name is needed for every field
+Formatter._converters = Formatter._collect_converters()
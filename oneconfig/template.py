@@ -14,17 +14,27 @@ def customfilter(method):
 
 class Generator():
     """The file generator, which creates files from templates."""
+
+    # Class property which stores the jinja2 environment, so all the generators
+    # of a class share its cache (each subclass gets its own, as it may have other filters)
+    _env = None
+
     def __init__(self):
-        self.env = Environment(
-            loader=PackageLoader('oneconfig', 'templates'),
-            autoescape=select_autoescape(['html', 'xml'], default_for_string=False),
-            trim_blocks=True,
-            lstrip_blocks=True,
-        )
-        # add all the customfilter methods in this class
-        for name, method in self.__dict__.items():
-            if getattr(method, 'is_custom_filter', False):
-                self.env.filters[name] = method
+        cls = type(self)
+        if cls.__dict__.get('_env') is None:  # first generator of this class creates it
+            cls._env = Environment(
+                loader=PackageLoader('oneconfig', 'templates'),
+                autoescape=select_autoescape(['html', 'xml'], default_for_string=False),
+                trim_blocks=True,
+                lstrip_blocks=True,
+            )
+            # add all the customfilter methods in this class (and the ones it inherits)
+            for klass in reversed(cls.__mro__):
+                for name, method in vars(klass).items():
+                    if getattr(method, 'is_custom_filter', False):
+                        cls._env.filters[name] = method
+        self.env = cls._env
+        self._template_cache: dict = {}  # template name -> compiled jinja2 template
 
     @customfilter
     def datetimeformat(value, format='%Y-%d-%m %H:%M:%S'):
@@ -39,6 +49,8 @@ class Generator():
             f.write(self.generate_str(file, template, **options))
 
     def generate_str(self, file: str, template, **options) -> str:
-        template = self.env.get_template('template')
+        compiled_template = self._template_cache.get(template)
+        if compiled_template is None:  # not loaded yet
+            compiled_template = self._template_cache[template] = self.env.get_template(template)
 
-        return template.render(the='variables', go='here')
+        return compiled_template.render(**options)
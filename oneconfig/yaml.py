@@ -1,6 +1,7 @@
 """Supplies methods used to load and save the YAML based configurations."""
 
-from typing import Any, Union
+from typing import Any
+import io
 import yaml
 import re
 from .formatter import Formatter  # format awesome stuff
@@ -10,6 +11,16 @@ try:
 except ImportError:
     pass              # all calls using `pandas` will fail
 
+# use the libyaml based (much faster) classes if they were compiled in
+CSafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+CSafeDumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+# patterns used over and over again, so compile them only once
+_CONSTRUCTOR_DOC_RE = re.compile(r'''^['"](![A-Z_][A-Z_0-9\.]*)['"] ''', re.IGNORECASE)
+
+# types of the YAML leaves that never contain anything to resolve
+_SCALAR_TYPES = frozenset((str, int, float, bool, type(None)))
+
 
 # Extension to an existing argument ---------------------------------------------------------------
 
@@ -17,6 +28,7 @@ except ImportError:
 class ExtendedArgument(object):
     """An Extension to an existing argument."""
     # TODO: Add usage examples and tests
+    __slots__ = ('value_pattern', '_ops', '_resolve')  # there can be lots of them
 
     # Class property which stores the formatter for json
     formatter = Formatter(dot_item_access=True)  # use a more powerfull formatter
@@ -30,7 +42,17 @@ class ExtendedArgument(object):
             format:         use format on strings to interpolate old properties
 
         """
+        self._prepare(value_pattern)
+
+    def _prepare(self, value_pattern) -> None:
+        """Parse the pattern and compile a function resolving it, so this is only done once."""
         self.value_pattern = value_pattern
+        # the resolve function is None if the pattern is too complicated to be compiled
+        self._ops, self._resolve = self.formatter._compile_pattern(value_pattern)
+
+    def __reduce__(self):
+        """Pickle only the pattern, the compiled function is created again when loading."""
+        return (self.__class__, (self.value_pattern,))
 
     def __repr__(self):
         """Represent as a string."""
@@ -50,13 +72,15 @@ class ExtendedArgument(object):
             substitutions = {}
 
         try:
-            return self.formatter.format(self.value_pattern, **substitutions)
+            if self._resolve is not None:
+                return self._resolve(substitutions)
+            return self.formatter._format_split(self._ops, substitutions)
         except (KeyError, IndexError) as e:
             raise KeyError(f'The value pattern "{self.value_pattern}" could not be resolved')
 
     def __set__(self, instance, value: str) -> None:
         """Set the value for this."""
-        self.value_pattern = value
+        self._prepare(value)  # the old one is outdated
 
 
 # Decorators --------------------------------------------------------------------------------------
@@ -68,11 +92,12 @@ def auto_attach_yaml_constructors(cls):
     To achieve this the docstring must start with ``"!Shortcut"``,
     where ``classname`` is the name of the class you want to use.
     """
-    for attr in dir(cls):
-        if attr.startswith('construct_'):
-            method = getattr(cls, attr)
-            doc = str(method.__doc__)
-            matches = re.match(r'''^['"](![A-Z_][A-Z_0-9\.]*)['"] ''', doc, re.IGNORECASE)
+    for attr, method in list(cls.__dict__.items()):  # inherited ones are attached already
+        if attr.startswith('construct_') and callable(method):
+            doc = method.__doc__
+            if not doc:
+                continue
+            matches = _CONSTRUCTOR_DOC_RE.match(doc)
             if matches:
                 cls.add_constructor(matches[1], method)
     return cls
@@ -84,11 +109,8 @@ def auto_attach_yaml_representers(cls):
     To achieve this the typehint for the ``data`` argument must be the class
     you want to represent.
     """
-    for attr in dir(cls):
-        if attr.startswith('represent_'):
-            method = getattr(cls, attr)
-            doc = str(method.__doc__)
-
+    for attr, method in list(cls.__dict__.items()):  # inherited ones are attached already
+        if attr.startswith('represent_') and callable(method):
             try:
                 represented_class = method.__annotations__['data']
             except KeyError:
@@ -102,7 +124,7 @@ def auto_attach_yaml_representers(cls):
 # Loader and Dumper -------------------------------------------------------------------------------
 
 @auto_attach_yaml_constructors
-class ConfigYamlLoader(yaml.SafeLoader):
+class ConfigYamlLoader(CSafeLoader):
     """A configuration loader created for OneConfig projects.
 
     ... but of course this might also be useful if you need configuration files
@@ -125,7 +147,7 @@ class ConfigYamlLoader(yaml.SafeLoader):
         return ExtendedArgument(string_repr)
 
 @auto_attach_yaml_representers
-class ConfigYamlDumper(yaml.SafeDumper):
+class ConfigYamlDumper(CSafeDumper):
     """A Configuration dumper created for OneConfig projects."""
 
     def represent_pandas_timestamp(self, data: pandas.Timestamp):
@@ -137,6 +159,26 @@ class ConfigYamlDumper(yaml.SafeDumper):
         return self.represent_scalar('!Timedelta', str(data))
 
 
+# Paths -------------------------------------------------------------------------------------------
+
+def _iter_path_segments(path: str):
+    """Split a (json) path into the keys and indices it consists of.
+
+    Example:
+        >>> list(_iter_path_segments('colors[1].green.hue'))
+        ['colors', 1, 'green', 'hue']
+    """
+    for part in path.split('.'):
+        if part.endswith(']'):
+            name, _, indices = part.partition('[')
+            if name:
+                yield name
+            for index in indices[:-1].split(']['):
+                yield int(index)
+        else:
+            yield part
+
+
 # Configuration class -----------------------------------------------------------------------------
 
 class Configuration(dict):
@@ -156,11 +198,7 @@ class Configuration(dict):
         Additionally you can supply ``source_filename`` so the config knows
         which file it was loaded from.
         """
-        if 'source_filename' in kwargs:
-            self.source_filename =  kwargs['source_filename']
-            del kwargs['source_filename']
-        else:
-            self.source_filename = None
+        self.source_filename = kwargs.pop('source_filename', None)
         super().__init__(*args, **kwargs)
 
     def __repr__(self) -> str:
@@ -176,14 +214,32 @@ class Configuration(dict):
             data:   A part of the configurations YAML tree you want to resolve.
 
         """
-        if isinstance(data, ExtendedArgument):
+        if type(data) in _SCALAR_TYPES:  # cheaper than the isinstance checks
+            return data
+        elif isinstance(data, ExtendedArgument):
             return data.__get__(root=self)
-        elif isinstance(data, dict):
-            for key, node in data.items():
-                data[key] = self.resolve_extended_arguments(node)
-        elif isinstance(data, list):
-            for i, node in enumerate(data):
-                data[i] = self.resolve_extended_arguments(node)
+        elif not isinstance(data, (dict, list)):
+            return data  # nothing to resolve
+
+        # walk the tree without recursion, the stack holds the containers we are still in
+        # together with their remaining keys (a snapshot, so changing the container is safe)
+        stack = [(data, iter(list(data) if isinstance(data, dict) else range(len(data))))]
+        seen = {id(data)}  # YAML aliases can share containers or even make them contain themselves
+        while stack:
+            container, keys = stack[-1]
+            for key in keys:
+                node = container[key]
+                if type(node) in _SCALAR_TYPES:
+                    continue
+                elif isinstance(node, ExtendedArgument):
+                    container[key] = node.__get__(root=self)
+                elif isinstance(node, (dict, list)) and id(node) not in seen:
+                    seen.add(id(node))
+                    child_keys = list(node) if isinstance(node, dict) else range(len(node))
+                    stack.append((node, iter(child_keys)))
+                    break  # go down first, so the order stays the same
+            else:
+                stack.pop()  # all children done
         return data  # return the result
 
     @classmethod
@@ -220,39 +276,46 @@ class Configuration(dict):
 
     def as_yaml(self, output_stream=None) -> str:
         """Represent config as a YAML string."""
-        return yaml.dump( self,
-                          output_stream,
-                          default_flow_style=False,
-                          Dumper=self.__class__.config_dumper_class)
+        # without a stream let the emitter write into one buffer
+        stream = io.StringIO() if output_stream is None else output_stream
+        yaml.dump( self,
+                   stream,
+                   default_flow_style=False,
+                   Dumper=self.__class__.config_dumper_class)
+        if output_stream is None:
+            return stream.getvalue()
 
     def __call__(self, path: str, default: str = NotImplemented):
         """Get a node in the config tree by it’s (json) path."""
         node = self
-        for match in re.findall(r'([A-Z_][A-Z_0-9]*)|\[(-?[0-9]+)\][.|$]', path, re.IGNORECASE):
-            # print(path, match[1], match[2])
-            try:
-                node = node[match[0] or int(match[1])]
-            except (KeyError, IndexError):
-                if default is NotImplemented:  raise ValueError(f'"{path}" not found in the config')
-                else:                          return default
+        if not path:  # the empty path is the whole config
+            return node
+        try:
+            for key_or_index in _iter_path_segments(path):
+                node = node[key_or_index]
+        except (KeyError, IndexError, ValueError):  # ValueError: the index is no integer
+            if default is NotImplemented:  raise ValueError(f'"{path}" not found in the config')
+            else:                          return default
         return node
 
     def set(self, path: str, value) -> None:
         """Set a node in the config tree to a value."""
         node = self
-        matches = re.findall(r'([A-Z_][A-Z_0-9]*)|\[(-?[0-9]+)\][.|$]', path, re.IGNORECASE)
+        try:
+            segments = list(_iter_path_segments(path)) if path else []
+        except ValueError:  # the index is no integer
+            segments = []
+        if not segments:
+            raise ValueError(f'"{path}" is not a valid path in the config')
 
-        for match in matches[:-1]:
-            # print(path, match[0], match[1])
-            key_or_index = match[0] or int(match[1])
+        for key_or_index in segments[:-1]:
             try:
                 node = node[key_or_index]
             except (KeyError, IndexError):
                 node[key_or_index] = {}
                 node = node[key_or_index]
 
-        match = matches[-1]
-        node[match[0] or int(match[1])] = value
+        node[segments[-1]] = value
 
     def check_integrity(self, schema: dict):
         """Check whether the config adheres to the given schema.
@@ -263,3 +326,7 @@ class Configuration(dict):
         """
         # TODO: create this functionality, that checks
         raise NotImplementedError('No integrity check possible yet')
+
+
+# configurations are dumped like any other dict
+ConfigYamlDumper.add_representer(Configuration, ConfigYamlDumper.represent_dict)